@@ -7,19 +7,34 @@ chronologically for penetration testing analysis.
 """
 
 import csv
+import heapq
+import multiprocessing
 import re
 import sys
 import os
+import pickle
 import shlex
+import shutil
+import tarfile
+import tempfile
+import threading
 from pathlib import Path
 from dataclasses import dataclass
+from itertools import chain
+from operator import attrgetter, itemgetter
 from datetime import datetime, timezone
-from typing import List, Dict, Optional, Tuple
-from collections import defaultdict
+from typing import List, Dict, Optional, Tuple, Iterator, Iterable
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
 import subprocess
 
 
-@dataclass
+# One LogEntry exists per log entry, so drop the per-instance __dict__
+# where the running Python supports slotted dataclasses (3.10+)
+_DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class LogEntry:
     """Represents a single log entry with timestamp and content."""
     timestamp: datetime
@@ -28,22 +43,38 @@ class LogEntry:
     source_file: str
     ip_address: Optional[str] = None
     date_folder: Optional[str] = None
+    ts_prefix: str = ''
+    sort_key: int = 0
+
+    def __post_init__(self):
+        if not self.ts_prefix:
+            self.ts_prefix = self.timestamp.strftime('%m/%d %H:%M:%S')
+        if not self.sort_key:
+            self.sort_key = LogEntry.make_sort_key(self.timestamp)
+
+    @staticmethod
+    def make_sort_key(timestamp: datetime) -> int:
+        """Pack a UTC timestamp into an int that orders like the datetime."""
+        return LogEntry.pack_sort_key(timestamp.year, timestamp.month, timestamp.day,
+                                      timestamp.hour, timestamp.minute, timestamp.second)
+
+    @staticmethod
+    def pack_sort_key(year: int, month: int, day: int, hour: int, minute: int, second: int) -> int:
+        """Pack already-parsed timestamp fields into a sort key."""
+        return (((((year * 13 + month) * 32 + day) * 24 + hour) * 60 + minute) * 60 + second)
 
     def format(self) -> str:
         """Reconstruct entry in original log format."""
-        if not self.content:
-            return (
-                f"{self.timestamp.strftime('%m/%d %H:%M:%S')} UTC "
-                f"[{self.entry_type}] (empty)\n"
-            )
+        content = self.content
+        if len(content) == 1:
+            return f"{self.ts_prefix} UTC [{self.entry_type}] {content[0]}\n"
+        if not content:
+            return f"{self.ts_prefix} UTC [{self.entry_type}] (empty)\n"
+        return f"{self.ts_prefix} UTC [{self.entry_type}] {content[0]}\n" + '\n'.join(content[1:]) + '\n'
 
-        lines = [
-            f"{self.timestamp.strftime('%m/%d %H:%M:%S')} UTC "
-            f"[{self.entry_type}] {self.content[0]}"
-        ]
-        if len(self.content) > 1:
-            lines.extend(self.content[1:])
-        return '\n'.join(lines) + '\n'
+    def format_bytes(self) -> bytes:
+        """Reconstruct entry in original log format as UTF-8 bytes."""
+        return self.format().encode('utf-8')
 
 
 class SSHManager:
@@ -52,10 +83,43 @@ class SSHManager:
     CONNECTION_TIMEOUT = 10
     COMMAND_TIMEOUT = 30
     FILE_TRANSFER_TIMEOUT = 300
+    STREAM_BUFFER_SIZE = 1 << 20
+    CONTROL_PERSIST = '60s'
+    # A stalled connection is dropped after SERVER_ALIVE_INTERVAL *
+    # SERVER_ALIVE_COUNT_MAX seconds without a reply, ending any stream on it
+    SERVER_ALIVE_INTERVAL = 15
+    SERVER_ALIVE_COUNT_MAX = 4
+    # Reads NUL-separated paths on stdin and writes each file as a byte-count
+    # line followed by exactly that many bytes ('-1' if unreadable). The count
+    # is taken first so a log still being appended to cannot break framing,
+    # and the bytes are NUL-padded to the count so one that shrinks or
+    # vanishes before head reads it cannot either.
+    CAT_FILES_COMMAND = (
+        "xargs -0 sh -c '"
+        'for f; do '
+        'if [ -f "$f" ] && [ -r "$f" ] && n=$(wc -c < "$f" 2>/dev/null); then echo $n; '
+        '{ head -c "$n" -- "$f" 2>/dev/null; head -c "$n" /dev/zero; } | head -c "$n"; '
+        'else echo -1; fi; '
+        "done' sh"
+    )
 
     def __init__(self, ssh_config_host: str):
         self.ssh_config_host = ssh_config_host
         self.connected = False
+        self._control_dir = None
+        self._ssh_common = []
+
+        # Share one authenticated connection between all ssh/scp calls.
+        # OpenSSH for Windows has no control socket support.
+        if os.name != 'nt':
+            self._control_dir = tempfile.mkdtemp(prefix='logstriker-')
+            self._ssh_common = ['-o', f'ControlPath={self._control_dir}/cm-%C']
+
+        # Streams have no overall timeout, so rely on keepalives to notice a dead link
+        self._keepalive = [
+            '-o', f'ServerAliveInterval={self.SERVER_ALIVE_INTERVAL}',
+            '-o', f'ServerAliveCountMax={self.SERVER_ALIVE_COUNT_MAX}'
+        ]
 
     def connect(self) -> bool:
         """Test SSH connection using config entry."""
@@ -72,6 +136,7 @@ class SSHManager:
 
             if result.returncode == 0 and 'connected' in result.stdout:
                 self.connected = True
+                self._start_master()
                 return True
             else:
                 return False
@@ -81,6 +146,48 @@ class SSHManager:
             print("[!] SSH client not found. Please ensure OpenSSH is installed.")
             return False
 
+    def _start_master(self):
+        """Start a background master connection for later calls to reuse.
+
+        ControlPersist backgrounds the master and ends it once idle. Its
+        stdio goes to /dev/null so no caller is left waiting on a pipe it
+        holds open. If it fails to start, later calls just connect directly.
+        """
+        if not self._control_dir:
+            return
+
+        try:
+            subprocess.run(
+                ['ssh', '-q', '-o', 'BatchMode=yes', '-o', 'ConnectTimeout=5',
+                 *self._ssh_common, *self._keepalive, '-o', 'ControlMaster=yes',
+                 '-o', f'ControlPersist={self.CONTROL_PERSIST}', '-N', self.ssh_config_host],
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                timeout=self.CONNECTION_TIMEOUT
+            )
+        except subprocess.TimeoutExpired:
+            pass
+
+    def close(self):
+        """Stop the master connection and remove its control socket directory."""
+        if not self._control_dir:
+            return
+
+        if self.connected:
+            try:
+                subprocess.run(
+                    ['ssh', *self._ssh_common, '-O', 'exit', self.ssh_config_host],
+                    capture_output=True,
+                    timeout=self.CONNECTION_TIMEOUT
+                )
+            except (subprocess.TimeoutExpired, FileNotFoundError):
+                pass
+
+        shutil.rmtree(self._control_dir, ignore_errors=True)
+        self._control_dir = None
+        self.connected = False
+
     def execute_command(self, command: str) -> Tuple[int, str, str]:
         """Execute command on remote server."""
         if not self.connected:
@@ -88,7 +195,7 @@ class SSHManager:
 
         try:
             result = subprocess.run(
-                ['ssh', self.ssh_config_host, command],
+                ['ssh', *self._ssh_common, self.ssh_config_host, command],
                 capture_output=True,
                 text=True,
                 encoding='utf-8',
@@ -106,7 +213,7 @@ class SSHManager:
 
         try:
             result = subprocess.run(
-                ['scp', '-q', f'{self.ssh_config_host}:{remote_path}', local_path],
+                ['scp', '-q', *self._ssh_common, f'{self.ssh_config_host}:{remote_path}', local_path],
                 capture_output=True,
                 timeout=self.FILE_TRANSFER_TIMEOUT
             )
@@ -116,12 +223,124 @@ class SSHManager:
 
     def read_remote_file(self, remote_path: str) -> Optional[str]:
         """Read file content from remote server."""
-        safe_path = shlex.quote(remote_path)
-        returncode, stdout, stderr = self.execute_command(f'cat {safe_path}')
-        if returncode == 0:
-            return stdout
+        for _, data in self.cat_files([remote_path]):
+            return data.decode('utf-8', errors='replace')
         return None
 
+    def cat_files(self, remote_paths: List[str]) -> Iterator[Tuple[str, bytes]]:
+        """Read multiple remote files in one SSH call without tar.
+
+        Paths are sent NUL-separated on stdin, so they need no shell quoting.
+        Yields (remote_path, content) in order, skipping unreadable files;
+        a file cut short while being read yields only what was left of it.
+        """
+        if not self.connected or not remote_paths:
+            return
+
+        try:
+            proc = subprocess.Popen(
+                ['ssh', *self._ssh_common, *self._keepalive, self.ssh_config_host, self.CAT_FILES_COMMAND],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                bufsize=self.STREAM_BUFFER_SIZE
+            )
+        except FileNotFoundError:
+            print("[!] SSH client not found. Please ensure OpenSSH is installed.")
+            return
+
+        writer = self._feed_stdin(proc, b'\0'.join(path.encode('utf-8') for path in remote_paths))
+
+        try:
+            for remote_path in remote_paths:
+                try:
+                    size = int(proc.stdout.readline())
+                except ValueError:
+                    break
+                if size < 0:
+                    continue
+
+                data = proc.stdout.read(size)
+                if len(data) < size:
+                    break
+                # Drop the padding of a file that shrank or vanished mid-read
+                yield remote_path, data.rstrip(b'\0')
+        finally:
+            self._finish_stream(proc, writer)
+
+    @staticmethod
+    def _feed_stdin(proc: subprocess.Popen, data: bytes) -> threading.Thread:
+        """Write data to a process's stdin from a separate thread.
+
+        This lets the remote side start producing output before it has read
+        all of its input, without either end blocking on a full pipe.
+        """
+        def feed():
+            try:
+                proc.stdin.write(data)
+                proc.stdin.close()
+            except (BrokenPipeError, OSError):
+                pass
+
+        writer = threading.Thread(target=feed, daemon=True)
+        writer.start()
+        return writer
+
+    def _finish_stream(self, proc: subprocess.Popen, writer: threading.Thread):
+        """Close a streaming ssh process and reap it."""
+        proc.stdout.close()
+        writer.join()
+        try:
+            proc.wait(timeout=self.FILE_TRANSFER_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+
+    def stream_files(self, remote_paths: List[str]) -> Iterator[Tuple[str, bytes]]:
+        """Stream multiple remote files over a single SSH connection as a tar archive.
+
+        Yields (remote_path, content) pairs in the order tar emits them. Any
+        files tar could not deliver (e.g. tar missing on the teamserver) are
+        fetched afterwards with one cat_files call.
+        """
+        if not self.connected or not remote_paths:
+            return
+
+        # tar strips the leading '/' from member names
+        pending = {path.lstrip('/'): path for path in remote_paths}
+
+        try:
+            proc = subprocess.Popen(
+                ['ssh', *self._ssh_common, *self._keepalive, self.ssh_config_host,
+                 'tar', '-cf', '-', '-T', '-'],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                bufsize=self.STREAM_BUFFER_SIZE
+            )
+        except FileNotFoundError:
+            print("[!] SSH client not found. Please ensure OpenSSH is installed.")
+            return
+
+        writer = self._feed_stdin(proc, ''.join(f'{path}\n' for path in remote_paths).encode('utf-8'))
+
+        try:
+            with tarfile.open(fileobj=proc.stdout, mode='r|', bufsize=self.STREAM_BUFFER_SIZE) as archive:
+                for member in archive:
+                    if not member.isfile():
+                        continue
+                    remote_path = pending.pop(member.name, None)
+                    if remote_path is None:
+                        continue
+                    data = archive.extractfile(member).read()
+                    yield remote_path, data
+        except tarfile.TarError:
+            pass
+        finally:
+            self._finish_stream(proc, writer)
+
+        yield from self.cat_files(list(pending.values()))
+
 
 class LogDiscovery:
     """Discovers and inventories Cobalt Strike logs."""
@@ -129,6 +348,15 @@ class LogDiscovery:
     DEFAULT_LOGS_PATH = '/opt/tools/cobaltstrike/server/logs'
     DATE_PATTERN = re.compile(r'/(\d{6})/')
     IP_PATTERN = re.compile(r'/(\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})/')
+    # The usual .../YYMMDD/IP/beacon_*.log layout in one search; anything
+    # else falls back to DATE_PATTERN and IP_PATTERN separately
+    BEACON_PATH_PATTERN = re.compile(r'/(\d{6})/(\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})/')
+    SYSTEM_LOG_SUFFIXES = (
+        ('/download.log', 'download'),
+        ('/weblog_80.log', 'weblog_80'),
+        ('/weblog_443.log', 'weblog_443'),
+        ('/events.log', 'events')
+    )
 
     def __init__(self, ssh_manager: SSHManager):
         self.ssh = ssh_manager
@@ -205,41 +433,41 @@ class LogDiscovery:
             return inventory
 
         date_folders = set()
-        ip_addresses = set()
 
-        for log_file in stdout.strip().split('\n'):
-            if not log_file:
-                continue
+        beacon_logs = inventory['beacon_logs']
+        system_logs = inventory['system_logs']
+        search_beacon_path = self.BEACON_PATH_PATTERN.search
 
+        for log_file in stdout.split('\n'):
             if 'beacon_' in log_file:
-                date_match = self.DATE_PATTERN.search(log_file)
-                ip_match = self.IP_PATTERN.search(log_file)
-
-                if date_match and ip_match:
+                path_match = search_beacon_path(log_file)
+                if path_match:
+                    date_folder, ip_address = path_match.groups()
+                else:
+                    date_match = self.DATE_PATTERN.search(log_file)
+                    ip_match = self.IP_PATTERN.search(log_file)
+                    if not (date_match and ip_match):
+                        continue
                     date_folder = date_match.group(1)
                     ip_address = ip_match.group(1)
 
-                    date_folders.add(date_folder)
-                    ip_addresses.add(ip_address)
+                date_folders.add(date_folder)
 
-                    inventory['beacon_logs'][ip_address].append({
-                        'path': log_file,
-                        'date_folder': date_folder
-                    })
+                ip_logs = beacon_logs.get(ip_address)
+                if ip_logs is None:
+                    ip_logs = beacon_logs[sys.intern(ip_address)] = []
+                ip_logs.append({
+                    'path': log_file,
+                    'date_folder': date_folder
+                })
             else:
-                filename = os.path.basename(log_file)
-
-                if filename == 'download.log':
-                    inventory['system_logs']['download'].append(log_file)
-                elif filename == 'weblog_80.log':
-                    inventory['system_logs']['weblog_80'].append(log_file)
-                elif filename == 'weblog_443.log':
-                    inventory['system_logs']['weblog_443'].append(log_file)
-                elif filename == 'events.log':
-                    inventory['system_logs']['events'].append(log_file)
+                for suffix, log_type in self.SYSTEM_LOG_SUFFIXES:
+                    if log_file.endswith(suffix):
+                        system_logs[log_type].append(log_file)
+                        break
 
         print(f"[+] Found {len(date_folders)} date folders: {', '.join(sorted(date_folders))}")
-        print(f"[+] Found {len(ip_addresses)} unique IP addresses")
+        print(f"[+] Found {len(beacon_logs)} unique IP addresses")
 
         total_beacon_logs = sum(len(logs) for logs in inventory['beacon_logs'].values())
         total_system_logs = sum(len(logs) for logs in inventory['system_logs'].values())
@@ -252,9 +480,13 @@ class LogDiscovery:
 class LogParser:
     """Parses Cobalt Strike log files into LogEntry objects."""
 
+    # A whole timestamp line, led by the '\n' that ends the line before it so
+    # re can use its fast literal search; [^\S\n] is whitespace within a line
     TIMESTAMP_PATTERN = re.compile(
-        r'^(\d{2}/\d{2})\s+(\d{2}:\d{2}:\d{2})\s+UTC\s+\[([^\]]+)\]\s+(.*)$'
+        r'\n([01]\d/\d{2})[^\S\n]+(\d{2}:\d{2}:\d{2})[^\S\n]+UTC[^\S\n]+\[([^\]\n]+)\][^\S\n]+(.*)'
     )
+    # Line boundaries str.splitlines() honours besides '\n'
+    EXTRA_LINE_BREAKS = ('\r', '\x0b', '\x0c', '\x1c', '\x1d', '\x1e', '\x85', '\u2028', '\u2029')
     UTC_TZ = timezone.utc
     DATE_FOLDER_FORMAT = '%y%m%d'
 
@@ -271,49 +503,89 @@ class LogParser:
             year_suffix = int(date_folder[:2])
             base_year = 2000 + year_suffix
 
+        # Every entry references these, and entry types come from a small
+        # set, so share one string object per value
+        if ip_address is not None:
+            ip_address = sys.intern(ip_address)
+
         entries = []
         current_entry = None
+        # Bursts of entries share a second, so reuse the last parsed timestamp
+        last_mm_dd = last_time_str = None
+        parsed_timestamp = None
+
+        # The scan below only splits on '\n', so fold any other line break
+        # (e.g. CRLF from Windows command output) into '\n' first
+        if any(line_break in content for line_break in LogParser.EXTRA_LINE_BREAKS):
+            content = '\n'.join(content.splitlines()) + '\n'
+
+        # Scan the whole buffer for timestamp lines in one pass. The text
+        # between two matches holds only continuation lines and is sliced out
+        # and split in one go. A leading '\n' lets the first line match too,
+        # and a trailing '\n' does not start another line.
+        buffer = '\n' + content
+        buffer_end = len(buffer) - 1 if buffer.endswith('\n') else len(buffer)
+        region_start = 0
+
+        for match in chain(LogParser.TIMESTAMP_PATTERN.finditer(buffer, 0, buffer_end), (None,)):
+            region_end = match.start() if match else buffer_end
+
+            if region_end > region_start:
+                lines = buffer[region_start + 1:region_end].split('\n')
+                if current_entry:
+                    current_entry.content.extend(lines)
+                else:
+                    for line in lines:
+                        if line.strip():
+                            print(f"[!] Warning: Orphaned line in {source_file}: {line[:50]}")
 
-        for line in content.splitlines():
-            match = LogParser.TIMESTAMP_PATTERN.match(line)
+            if match is None:
+                break
+            region_start = match.end()
 
-            if match:
-                if current_entry:
-                    entries.append(current_entry)
+            if current_entry:
+                entries.append(current_entry)
 
-                mm_dd, time_str, entry_type, content_line = match.groups()
+            mm_dd, time_str, entry_type, content_line = match.groups()
 
-                try:
-                    month, day = map(int, mm_dd.split('/'))
-                    hour, minute, second = map(int, time_str.split(':'))
-
-                    timestamp = datetime(
-                        base_year, month, day, hour, minute, second,
-                        tzinfo=LogParser.UTC_TZ
-                    )
-
-                    current_entry = LogEntry(
-                        timestamp=timestamp,
-                        entry_type=entry_type,
-                        content=[content_line],
-                        source_file=source_file,
-                        ip_address=ip_address,
-                        date_folder=date_folder
-                    )
-                except (ValueError, OverflowError) as e:
-                    print(f"[!] Warning: Skipping malformed timestamp in {source_file}: {line[:80]}")
-                    current_entry = None
-            else:
-                if current_entry:
-                    current_entry.content.append(line)
-                elif line.strip():
-                    print(f"[!] Warning: Orphaned line in {source_file}: {line[:50]}")
+            try:
+                if time_str != last_time_str or mm_dd != last_mm_dd:
+                    parsed_timestamp = LogParser._parse_timestamp(mm_dd, time_str, base_year)
+                    last_mm_dd, last_time_str = mm_dd, time_str
+                timestamp, sort_key, ts_prefix = parsed_timestamp
+
+                current_entry = LogEntry(
+                    timestamp=timestamp,
+                    entry_type=sys.intern(entry_type),
+                    content=[content_line],
+                    source_file=source_file,
+                    ip_address=ip_address,
+                    date_folder=date_folder,
+                    ts_prefix=ts_prefix,
+                    sort_key=sort_key
+                )
+            except (ValueError, OverflowError) as e:
+                print(f"[!] Warning: Skipping malformed timestamp in {source_file}: {match.group(0)[1:81]}")
+                current_entry = None
 
         if current_entry:
             entries.append(current_entry)
 
         return entries
 
+    @staticmethod
+    def _parse_timestamp(mm_dd: str, time_str: str, base_year: int) -> Tuple[datetime, int, str]:
+        """Construct a UTC datetime, its sort key and its 'MM/DD HH:MM:SS' prefix.
+
+        The sort key and prefix come from the parsed fields rather than the
+        datetime; the regex guarantees two-digit fields.
+        """
+        month, day = map(int, mm_dd.split('/'))
+        hour, minute, second = map(int, time_str.split(':'))
+        timestamp = datetime(base_year, month, day, hour, minute, second, tzinfo=LogParser.UTC_TZ)
+        sort_key = LogEntry.pack_sort_key(base_year, month, day, hour, minute, second)
+        return timestamp, sort_key, f'{mm_dd} {time_str}'
+
     @staticmethod
     def parse_system_log(content: str, date_folder: str, source_file: str) -> List[LogEntry]:
         """Parse system log file (download, weblog, events)."""
@@ -324,49 +596,61 @@ class LogAggregator:
     """Aggregates and sorts log entries."""
 
     @staticmethod
-    def aggregate_by_ip(entries_by_ip: Dict[str, List[LogEntry]]) -> Dict[str, List[LogEntry]]:
-        """Combine and sort all entries per IP address."""
-        for entries in entries_by_ip.values():
-            entries.sort(key=lambda e: e.timestamp)
-        return entries_by_ip
+    def aggregate_by_ip(entries_by_ip: Dict[str, List[List[LogEntry]]]) -> Dict[str, Iterator[LogEntry]]:
+        """Lazily merge the per-file entry lists of each IP into chronological order."""
+        aggregated = {}
+
+        for ip, file_entries in entries_by_ip.items():
+            if not any(file_entries):
+                continue
+            aggregated[ip] = LogAggregator._merge_sorted(file_entries)
+
+        return aggregated
 
     @staticmethod
-    def aggregate_by_ip_and_date(entries_by_ip: Dict[str, List[LogEntry]]) -> Dict[Tuple[str, str], List[LogEntry]]:
+    def aggregate_by_ip_and_date(entries_by_ip: Dict[str, List[List[LogEntry]]]) -> Dict[Tuple[str, str], List[LogEntry]]:
         """Aggregate entries by IP address and date folder."""
-        aggregated = defaultdict(list)
+        aggregated = {}
 
-        for ip, entries in entries_by_ip.items():
-            for entry in entries:
-                if entry.date_folder:
-                    key = (ip, entry.date_folder)
-                    aggregated[key].append(entry)
+        for ip, file_entries in entries_by_ip.items():
+            # Every entry in a file shares that file's date folder
+            files_by_date = defaultdict(list)
+            for entries in file_entries:
+                if entries and entries[0].date_folder:
+                    files_by_date[entries[0].date_folder].append(entries)
 
-        for entries in aggregated.values():
-            entries.sort(key=lambda e: e.timestamp)
+            for date_folder in sorted(files_by_date):
+                aggregated[(ip, date_folder)] = list(
+                    LogAggregator._merge_sorted(files_by_date[date_folder])
+                )
 
-        return dict(aggregated)
+        return aggregated
 
     @staticmethod
-    def aggregate_all_chronologically(entries_by_ip: Dict[str, List[LogEntry]]) -> List[LogEntry]:
-        """Combine all entries across all IPs and sort chronologically."""
-        all_entries = []
-        for entries in entries_by_ip.values():
-            all_entries.extend(entries)
-        all_entries.sort(key=lambda e: e.timestamp)
-        return all_entries
+    def _merge_sorted(file_entries: List[List[LogEntry]]) -> Iterator[LogEntry]:
+        """K-way merge per-file entry lists into one chronological stream.
+
+        Beacon logs are written in order, so sorting each file first is a
+        linear check unless a file wraps the year boundary.
+        """
+        for entries in file_entries:
+            entries.sort(key=attrgetter('sort_key'))
+        return heapq.merge(*file_entries, key=attrgetter('sort_key'))
 
     @staticmethod
     def aggregate_system_logs(entries_by_type: Dict[str, List[LogEntry]]) -> Dict[str, List[LogEntry]]:
         """Combine and sort system log entries by type."""
         for entries in entries_by_type.values():
-            entries.sort(key=lambda e: e.timestamp)
+            entries.sort(key=attrgetter('sort_key'))
         return entries_by_type
 
 
 class LogWriter:
     """Writes aggregated logs to output files."""
 
-    FILE_BUFFER_SIZE = 65536
+    FILE_BUFFER_SIZE = 1 << 20
+    # Most CSV parts merged at once, keeping well under open-file limits
+    CSV_MERGE_FAN_IN = 64
     CSV_HEADERS = [
         'Command',
         'Date',
@@ -377,24 +661,24 @@ class LogWriter:
     ]
 
     @staticmethod
-    def write_complete_logs(aggregated_entries: Dict[str, List[LogEntry]], output_dir: Path) -> int:
-        """Write complete (all dates) combined log files per IP."""
+    def write_complete_logs(aggregated_entries: Dict[str, Iterable[LogEntry]], output_dir: Path) -> int:
+        """Write complete (all dates) combined log files per IP.
+
+        Entries are consumed as they are written, so merged iterators from
+        LogAggregator.aggregate_by_ip stream straight to disk.
+        """
         complete_dir = output_dir / "complete"
         complete_dir.mkdir(exist_ok=True)
 
         files_written = 0
 
         for ip, entries in aggregated_entries.items():
-            if not entries:
-                continue
-
             output_file = complete_dir / f"{ip}-Complete.log"
 
             try:
-                with open(output_file, 'w', encoding='utf-8', buffering=LogWriter.FILE_BUFFER_SIZE) as f:
-                    f.writelines(entry.format() for entry in entries)
+                entry_count = LogWriter._write_entries(entries, output_file)
 
-                print(f"    - {ip} ({len(entries)} entries) -> complete/{output_file.name}")
+                print(f"    - {ip} ({entry_count} entries) -> complete/{output_file.name}")
                 files_written += 1
             except IOError as e:
                 print(f"[!] Error writing {output_file}: {e}")
@@ -420,8 +704,7 @@ class LogWriter:
             output_file = daily_dir / f"{ip}-{date_folder}.log"
 
             try:
-                with open(output_file, 'w', encoding='utf-8', buffering=LogWriter.FILE_BUFFER_SIZE) as f:
-                    f.writelines(entry.format() for entry in entries)
+                LogWriter._write_entries(entries, output_file)
 
                 print(f"    - {ip} [{date_folder}] ({len(entries)} entries) -> daily/{output_file.name}")
                 files_written += 1
@@ -435,30 +718,62 @@ class LogWriter:
         return files_written
 
     @staticmethod
-    def write_csv_log(all_entries: List[LogEntry], output_dir: Path) -> bool:
-        """Write all entries to a single CSV file, ordered chronologically."""
+    def _write_entries(entries: Iterable[LogEntry], output_file: Path) -> int:
+        """Write entries as UTF-8 bytes in FILE_BUFFER_SIZE chunks, returning the count written."""
+        entry_count = 0
+        buffer = bytearray()
+
+        with open(output_file, 'wb') as f:
+            for entry in entries:
+                buffer += entry.format_bytes()
+                entry_count += 1
+                if len(buffer) >= LogWriter.FILE_BUFFER_SIZE:
+                    f.write(buffer)
+                    buffer.clear()
+            f.write(buffer)
+
+        return entry_count
+
+    @staticmethod
+    def write_csv_part(entries: Iterable[LogEntry], part_file: Path) -> bool:
+        """Spill chronologically ordered CSV rows, keyed by sort_key, to a part file for write_csv_log."""
+        try:
+            with open(part_file, 'wb') as f:
+                for entry in entries:
+                    pickle.dump((entry.sort_key, LogWriter._csv_row(entry)), f, pickle.HIGHEST_PROTOCOL)
+            return True
+        except IOError as e:
+            print(f"[!] Error writing CSV rows to {part_file}: {e}")
+            return False
+        except Exception as e:
+            print(f"[!] Unexpected error writing CSV rows to {part_file}: {e}")
+            return False
+
+    @staticmethod
+    def write_csv_log(part_files: List[Path], output_dir: Path, incomplete_ips: List[str]) -> bool:
+        """Merge the per-IP CSV parts into a single CSV file, ordered chronologically.
+
+        Fails if any IP's rows could not be spilled, after writing the rest.
+        """
         output_file = output_dir / "logstriker-combined.csv"
 
         try:
+            part_files = LogWriter._reduce_csv_parts(part_files)
+            entry_count = 0
+
             with open(output_file, 'w', encoding='utf-8', newline='') as f:
                 writer = csv.writer(f)
                 writer.writerow(LogWriter.CSV_HEADERS)
 
-                for entry in all_entries:
-                    command = ' '.join(entry.content) if entry.content else ''
-                    date_str = entry.timestamp.strftime('%Y-%m-%d')
-                    time_str = entry.timestamp.strftime('%H:%M:%S')
-
-                    writer.writerow([
-                        command,
-                        date_str,
-                        time_str,
-                        '',
-                        '',
-                        ''
-                    ])
-
-            print(f"    - logstriker-combined.csv ({len(all_entries)} entries)")
+                for _, row in LogWriter._merge_csv_parts(part_files):
+                    writer.writerow(row)
+                    entry_count += 1
+
+            if incomplete_ips:
+                print(f"[!] {output_file.name} is missing rows for: {', '.join(incomplete_ips)}")
+                return False
+
+            print(f"    - logstriker-combined.csv ({entry_count} entries)")
             return True
         except IOError as e:
             print(f"[!] Error writing {output_file}: {e}")
@@ -467,152 +782,310 @@ class LogWriter:
             print(f"[!] Unexpected error writing {output_file}: {e}")
             return False
 
+    @staticmethod
+    def _reduce_csv_parts(part_files: List[Path]) -> List[Path]:
+        """Merge runs of adjacent parts until at most CSV_MERGE_FAN_IN are left.
 
-def main():
-    """Main CLI interface."""
-    print("=" * 60)
-    print("LogStriker - Cobalt Strike Log Aggregation Tool")
-    print("=" * 60)
-    print()
+        Keeping runs adjacent and in order preserves the order of equal keys.
+        """
+        merge_count = 0
 
-    ssh_host = input("Enter SSH config host entry for teamserver: ").strip()
+        while len(part_files) > LogWriter.CSV_MERGE_FAN_IN:
+            merged_files = []
+            for start in range(0, len(part_files), LogWriter.CSV_MERGE_FAN_IN):
+                group = part_files[start:start + LogWriter.CSV_MERGE_FAN_IN]
+                merged_file = group[0].with_name(f"merged-{merge_count}.part")
+                merge_count += 1
 
-    if not ssh_host:
-        print("[!] No SSH host provided")
-        return 1
+                with open(merged_file, 'wb') as f:
+                    for item in LogWriter._merge_csv_parts(group):
+                        pickle.dump(item, f, pickle.HIGHEST_PROTOCOL)
+                for part_file in group:
+                    part_file.unlink()
 
-    print()
-    print(f"[*] Connecting to teamserver via SSH config: {ssh_host}")
+                merged_files.append(merged_file)
+            part_files = merged_files
 
-    ssh = SSHManager(ssh_host)
+        return part_files
 
-    if not ssh.connect():
-        print(f"[!] Failed to connect to '{ssh_host}'")
-        print()
-        print("Troubleshooting:")
-        print("  1. Check SSH config file (~/.ssh/config)")
-        print("  2. Verify host entry exists")
-        print(f"  3. Test connection: ssh {ssh_host}")
-        return 1
+    @staticmethod
+    def _merge_csv_parts(part_files: List[Path]) -> Iterator[Tuple[int, List[str]]]:
+        """Merge (sort_key, row) pairs from part files, keeping equal keys in part order."""
+        parts = [LogWriter._read_csv_part(part_file) for part_file in part_files]
+        return heapq.merge(*parts, key=itemgetter(0))
 
-    print("[+] Connected successfully")
-    print()
+    @staticmethod
+    def _read_csv_part(part_file: Path) -> Iterator[Tuple[int, List[str]]]:
+        """Yield the (sort_key, row) pairs spilled by write_csv_part."""
+        with open(part_file, 'rb') as f:
+            while True:
+                try:
+                    yield pickle.load(f)
+                except EOFError:
+                    return
 
-    discovery = LogDiscovery(ssh)
+    @staticmethod
+    def _csv_row(entry: LogEntry) -> List[str]:
+        """Build the CSV row for a single entry."""
+        command = ' '.join(entry.content) if entry.content else ''
+        date_str = entry.timestamp.strftime('%Y-%m-%d')
+        time_str = entry.timestamp.strftime('%H:%M:%S')
+
+        return [
+            command,
+            date_str,
+            time_str,
+            '',
+            '',
+            ''
+        ]
 
-    if not discovery.find_logs_directory():
-        return 1
 
-    print()
+def parse_logs(executor: ProcessPoolExecutor, parse, *job_columns) -> List[List[LogEntry]]:
+    """Run a LogParser method over columns of job arguments.
 
-    inventory = discovery.scan_structure()
+    Returning entries from a worker costs about half as much as parsing
+    them, so with one core or one file it is cheaper to parse in-process.
+    """
+    job_count = len(job_columns[0])
+    cpu_count = os.cpu_count() or 1
 
-    if not inventory['beacon_logs'] and not inventory['system_logs']:
-        print("[!] No log files found")
-        return 1
+    if cpu_count == 1 or job_count <= 1:
+        return list(map(parse, *job_columns))
 
-    print()
+    chunksize = max(1, job_count // (cpu_count * 4))
+    return list(executor.map(parse, *job_columns, chunksize=chunksize))
 
-    print("[*] Downloading and parsing beacon logs...")
 
-    beacon_entries_by_ip = defaultdict(list)
-    total_beacon_entries = 0
+def write_ip_logs(ip: str, file_entries: List[List[LogEntry]],
+                  output_dir: Path, csv_part: Path) -> Tuple[int, int, int, bool]:
+    """Write one IP's parsed beacon logs as its complete, daily and CSV part output.
 
-    for ip, log_files in inventory['beacon_logs'].items():
-        for log_info in log_files:
-            content = ssh.read_remote_file(log_info['path'])
+    Returns (entries written, complete logs written, daily logs written, CSV part written).
+    """
+    entry_count = sum(len(entries) for entries in file_entries)
 
-            if content is None:
-                print(f"[!] Warning: Failed to download {log_info['path']}")
-                continue
-            elif not content:
-                print(f"[!] Warning: Empty file {log_info['path']}")
-                continue
+    # Merge once; the complete log and the CSV part are then written (and
+    # can fail) independently
+    merged = {
+        ip_key: list(entries)
+        for ip_key, entries in LogAggregator.aggregate_by_ip({ip: file_entries}).items()
+    }
+    complete_files = LogWriter.write_complete_logs(merged, output_dir)
+    csv_written = LogWriter.write_csv_part(merged.get(ip, ()), csv_part)
+    del merged
 
-            entries = LogParser.parse_beacon_log(
-                content,
-                log_info['date_folder'],
-                log_info['path'],
-                ip
-            )
-            beacon_entries_by_ip[ip].extend(entries)
-            total_beacon_entries += len(entries)
+    daily_files = LogWriter.write_daily_logs(
+        LogAggregator.aggregate_by_ip_and_date({ip: file_entries}), output_dir
+    )
 
-    print(f"[+] Parsed {total_beacon_entries} entries from {len(inventory['beacon_logs'])} IPs")
+    return entry_count, complete_files, daily_files, csv_written
 
-    print("[*] Downloading and parsing system logs...")
 
-    system_entries_by_type = defaultdict(list)
-    total_system_entries = 0
+def main():
+    """Main CLI interface."""
+    print("=" * 60)
+    print("LogStriker - Cobalt Strike Log Aggregation Tool")
+    print("=" * 60)
+    print()
 
-    for log_type, log_files in inventory['system_logs'].items():
-        for log_path in log_files:
-            date_match = LogDiscovery.DATE_PATTERN.search(log_path)
-            if date_match:
-                date_folder = date_match.group(1)
-            else:
-                current_date = datetime.now()
-                date_folder = current_date.strftime(LogParser.DATE_FOLDER_FORMAT)
+    ssh_host = input("Enter SSH config host entry for teamserver: ").strip()
 
-            content = ssh.read_remote_file(log_path)
+    if not ssh_host:
+        print("[!] No SSH host provided")
+        return 1
 
-            if content is None or not content:
-                continue
+    print()
+    print(f"[*] Connecting to teamserver via SSH config: {ssh_host}")
 
-            entries = LogParser.parse_system_log(
-                content,
-                date_folder,
-                log_path
-            )
-            system_entries_by_type[log_type].extend(entries)
-            total_system_entries += len(entries)
+    ssh = SSHManager(ssh_host)
 
-    if total_system_entries > 0:
-        print(f"[+] Parsed {total_system_entries} entries from system logs")
-    else:
-        print(f"[+] No system logs found")
+    try:
+        if not ssh.connect():
+            print(f"[!] Failed to connect to '{ssh_host}'")
+            print()
+            print("Troubleshooting:")
+            print("  1. Check SSH config file (~/.ssh/config)")
+            print("  2. Verify host entry exists")
+            print(f"  3. Test connection: ssh {ssh_host}")
+            return 1
+
+        print("[+] Connected successfully")
+        print()
 
-    print()
-    print("[*] Aggregating logs for complete view...")
+        discovery = LogDiscovery(ssh)
 
-    aggregated_complete = LogAggregator.aggregate_by_ip(beacon_entries_by_ip)
-    print(f"[+] Created {len(aggregated_complete)} complete IP logs")
+        if not discovery.find_logs_directory():
+            return 1
 
-    print("[*] Aggregating logs by date...")
+        print()
 
-    aggregated_daily = LogAggregator.aggregate_by_ip_and_date(beacon_entries_by_ip)
-    unique_ips = set(ip for ip, _ in aggregated_daily.keys())
-    print(f"[+] Created {len(aggregated_daily)} daily logs across {len(unique_ips)} IPs")
+        inventory = discovery.scan_structure()
 
-    print("[*] Aggregating all logs chronologically for CSV...")
+        if not inventory['beacon_logs'] and not inventory['system_logs']:
+            print("[!] No log files found")
+            return 1
 
-    all_entries_chronological = LogAggregator.aggregate_all_chronologically(beacon_entries_by_ip)
-    print(f"[+] Aggregated {len(all_entries_chronological)} entries for CSV export")
+        print()
 
-    print()
+        beacon_files = {}
+        for ip, log_files in inventory['beacon_logs'].items():
+            for log_info in log_files:
+                beacon_files[log_info['path']] = (ip, log_info['date_folder'])
 
-    output_dir = Path.cwd()
-    print(f"[*] Writing output to: {output_dir}")
-    print()
+        system_files = {}
+        for log_type, log_files in inventory['system_logs'].items():
+            for log_path in log_files:
+                date_match = LogDiscovery.DATE_PATTERN.search(log_path)
+                if date_match:
+                    date_folder = date_match.group(1)
+                else:
+                    current_date = datetime.now()
+                    date_folder = current_date.strftime(LogParser.DATE_FOLDER_FORMAT)
+                system_files[log_path] = (log_type, date_folder)
 
-    complete_files = LogWriter.write_complete_logs(aggregated_complete, output_dir)
-    print()
-    daily_files = LogWriter.write_daily_logs(aggregated_daily, output_dir)
-    print()
+        output_dir = Path.cwd()
+        print(f"[*] Writing output to: {output_dir}")
+        print()
+        print("[*] Downloading, parsing and writing logs one IP at a time...")
+
+        # Files arrive grouped by IP, so each IP is parsed as soon as its last file is in
+        remaining_by_ip = {ip: len(log_files) for ip, log_files in inventory['beacon_logs'].items()}
+        contents_by_ip = defaultdict(dict)
+        system_jobs = []
+        missing_beacon_logs = set(beacon_files)
+
+        total_beacon_entries = 0
+        complete_files = 0
+        daily_files = 0
+        csv_parts = {}
+        csv_incomplete_ips = []
+
+        # Forked workers would inherit the stream's stdin pipe and keep the
+        # remote tar/xargs from ever seeing EOF, so always spawn them
+        pool_context = multiprocessing.get_context('spawn')
+
+        with ProcessPoolExecutor(mp_context=pool_context) as executor, \
+                tempfile.TemporaryDirectory(prefix='logstriker-') as csv_dir:
+
+            cpu_count = os.cpu_count() or 1
+            # IPs whose files are parsing in the pool, oldest first; they are
+            # written in this order while the download carries on
+            parsing_ips = deque()
+            max_parsing_ips = cpu_count * 2
+
+            def write_ip(ip, file_entries):
+                nonlocal total_beacon_entries, complete_files, daily_files
+
+                csv_parts[ip] = Path(csv_dir) / f"{len(csv_parts) + len(csv_incomplete_ips)}.part"
+                entry_count, complete_count, daily_count, csv_part_written = write_ip_logs(
+                    ip, file_entries, output_dir, csv_parts[ip]
+                )
+                total_beacon_entries += entry_count
+                complete_files += complete_count
+                daily_files += daily_count
+                if not csv_part_written:
+                    csv_incomplete_ips.append(ip)
+                    del csv_parts[ip]
+
+            def write_parsed_ips(max_pending):
+                """Write parsed IPs in order, waiting on the oldest while more than max_pending remain."""
+                while parsing_ips:
+                    ip, futures = parsing_ips[0]
+                    if len(parsing_ips) <= max_pending and not all(future.done() for future in futures):
+                        return
+                    parsing_ips.popleft()
+                    write_ip(ip, [future.result() for future in futures])
+
+            def flush_ip(ip):
+                contents = contents_by_ip.pop(ip, {})
+                beacon_jobs = [
+                    (contents[log_info['path']], log_info['date_folder'], log_info['path'], ip)
+                    for log_info in inventory['beacon_logs'][ip]
+                    if log_info['path'] in contents
+                ]
+                if not beacon_jobs:
+                    return
+
+                # A single core gains nothing from workers but the cost of
+                # shipping entries back
+                if cpu_count == 1:
+                    write_ip(ip, [LogParser.parse_beacon_log(*job) for job in beacon_jobs])
+                else:
+                    parsing_ips.append((ip, [
+                        executor.submit(LogParser.parse_beacon_log, *job) for job in beacon_jobs
+                    ]))
+
+            for log_path, data in ssh.stream_files(list(beacon_files) + list(system_files)):
+                content = data.decode('utf-8', errors='replace')
+
+                if 'beacon_' in log_path:
+                    missing_beacon_logs.discard(log_path)
+                    ip, date_folder = beacon_files[log_path]
+                    remaining_by_ip[ip] -= 1
+
+                    if not content:
+                        print(f"[!] Warning: Empty file {log_path}")
+                    else:
+                        contents_by_ip[ip][log_path] = content
+
+                    if remaining_by_ip[ip] == 0:
+                        flush_ip(ip)
+                    write_parsed_ips(max_parsing_ips)
+                else:
+                    if not content:
+                        continue
+
+                    log_type, date_folder = system_files[log_path]
+                    system_jobs.append((content, date_folder, log_path, log_type))
+
+            ssh.close()
+
+            for log_path in beacon_files:
+                if log_path in missing_beacon_logs:
+                    print(f"[!] Warning: Failed to download {log_path}")
+
+            # IPs with files that never arrived are written from what did
+            for ip in list(contents_by_ip):
+                flush_ip(ip)
+            write_parsed_ips(0)
+
+            system_entries_by_type = defaultdict(list)
+            total_system_entries = 0
+
+            contents, date_folders, paths, log_types = zip(*system_jobs) if system_jobs else ((),) * 4
+            results = parse_logs(executor, LogParser.parse_system_log, contents, date_folders, paths)
+            for log_type, entries in zip(log_types, results):
+                system_entries_by_type[log_type].extend(entries)
+                total_system_entries += len(entries)
+
+            print()
+            print(f"[+] Parsed {total_beacon_entries} entries from {len(inventory['beacon_logs'])} IPs")
+
+            if total_system_entries > 0:
+                print(f"[+] Parsed {total_system_entries} entries from system logs")
+            else:
+                print(f"[+] No system logs found")
 
-    print("[*] Writing CSV output...")
-    csv_written = LogWriter.write_csv_log(all_entries_chronological, output_dir)
+            print()
+            print("[*] Writing CSV output...")
+            csv_written = LogWriter.write_csv_log(
+                [csv_parts[ip] for ip in inventory['beacon_logs'] if ip in csv_parts],
+                output_dir, csv_incomplete_ips
+            )
 
-    print()
-    csv_count = 1 if csv_written else 0
-    print(f"[+] Complete! Wrote {complete_files + daily_files + csv_count} total files")
-    print(f"    - {complete_files} complete logs in complete/")
-    print(f"    - {daily_files} daily logs in daily/")
-    if csv_written:
-        print("    - 1 CSV file (logstriker-combined.csv)")
-    print(f"[+] Total entries processed: {total_beacon_entries}")
-
-    return 0
+        print()
+        csv_count = 1 if csv_written else 0
+        print(f"[+] Complete! Wrote {complete_files + daily_files + csv_count} total files")
+        print(f"    - {complete_files} complete logs in complete/")
+        print(f"    - {daily_files} daily logs in daily/")
+        if csv_written:
+            print("    - 1 CSV file (logstriker-combined.csv)")
+        print(f"[+] Total entries processed: {total_beacon_entries}")
+
+        return 0
+    finally:
+        ssh.close()
 
 
 if __name__ == '__main__':